@@ -1,6 +1,7 @@
 from typing import cast, Any, Callable, TypeVar
 from abc import ABCMeta as NativeABCMeta
 from abc import abstractmethod, abstractproperty
+from inspect import BoundArguments, signature
 
 R = TypeVar('R')
 
@@ -32,6 +33,33 @@ class ABCMeta(NativeABCMeta):
                 )
             )
         return instance
+
+class InterningABCMeta(ABCMeta):
+    """ABCMeta that hands out one shared instance per class and positional
+    constructor arguments. Keyword arguments are bound to their positions
+    first, so ``C(x)`` and ``C(x=x)`` share an instance. Classes setting
+    ``_intern = False`` and arguments that cannot be made positional bypass
+    the cache, so classes with parameters should still define value-based
+    equality and hashing.
+    """
+    def __init__(cls, *args : Any, **kwargs : Any) -> None:
+        super().__init__(*args, **kwargs)
+        cls._instances : dict[tuple[Any, ...], Any] = {}
+
+    def __call__(cls, *args : Any, **kwargs : Any) -> NativeABCMeta:
+        if not getattr(cls, "_intern", True):
+            return super().__call__(*args, **kwargs)
+        if kwargs:
+            bound : BoundArguments = signature(cls.__init__).bind(None, *args, **kwargs)
+            if bound.kwargs:
+                return super().__call__(*args, **kwargs)
+            args = bound.args[1:]
+
+        instance : NativeABCMeta | None = cls._instances.get(args)
+        if instance is None:
+            instance = super().__call__(*args)
+            cls._instances[args] = instance
+        return instance
     
 class ABC(metaclass=ABCMeta):
     """Helper class that provides a standard way to create an ABC using
@@ -0,0 +1,220 @@
+from representations import Constituent
+from containers import RepSet
+from transitions import TRANSITION_SYSTEM_VERSION
+
+from typing import Iterable, Sequence, IO
+from collections import OrderedDict
+from array import array
+
+import fcntl
+import hashlib
+import json
+import os
+
+def oracle_key(gold_tree : RepSet[Constituent], labels : Sequence[str], num_tokens : int,
+               oracle_version : int, version : int = TRANSITION_SYSTEM_VERSION) -> str:
+    """Content hash of everything an oracle derivation depends on, including
+    the version of the oracle that produced it. Constituents are serialised
+    as JSON in a canonical order so that equal trees share a key and no label
+    can be mistaken for a separator."""
+    constituents : list[tuple[str, list[int]]] = sorted((str(constituent.label), sorted(int(t) for t in constituent))
+                                                        for constituent in gold_tree)
+    content : str = json.dumps([version, oracle_version, num_tokens, [str(label) for label in labels], constituents])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+class OracleCache:
+    """On-disk cache of oracle derivations stored as action id sequences.
+
+    Derivations are appended to a data file; an append-only index records
+    ``<key> <offset> <length>`` for every write and every hit, so that the
+    last line of a key gives its location and the order of last lines gives
+    the LRU order. Once data and index together outgrow ``max_bytes`` the
+    cache is compacted, dropping the least recently used derivations; when
+    only the index has piled up too many superseded lines it is rewritten on
+    its own. The first line of the index is a random generation tag that
+    changes on every rewrite.
+
+    Any number of processes may read concurrently (shared lock); writes and
+    compaction take an exclusive lock.
+    """
+    _typecode : str = "i"
+
+    def __init__(self, directory : str, max_bytes : int = 256 * 2**20) -> None:
+        self.directory : str = directory
+        self.max_bytes : int = max_bytes
+        os.makedirs(directory, exist_ok = True)
+
+        self._data_path : str = os.path.join(directory, "derivations.bin")
+        self._index_path : str = os.path.join(directory, "derivations.idx")
+        self._lock_path : str = os.path.join(directory, "derivations.lock")
+
+        self._index : OrderedDict[str, tuple[int, int]] = OrderedDict()
+        self._generation : bytes = b""
+        self._index_offset : int = 0
+        self._index_lines : int = 0
+
+    def _lock(self, mode : int) -> IO[bytes]:
+        lock_file : IO[bytes] = open(self._lock_path, "ab")
+        fcntl.flock(lock_file, mode)
+        return lock_file
+
+    def _refresh(self) -> None:
+        """Loads index lines written since the last call, or the whole index
+        if it was replaced by a compaction. Requires a held lock."""
+        try:
+            index_file : IO[bytes] = open(self._index_path, "rb")
+        except FileNotFoundError:
+            self._index.clear()
+            self._generation, self._index_offset, self._index_lines = b"", 0, 0
+            return
+
+        with index_file:
+            generation : bytes = index_file.readline()
+            if generation != self._generation:
+                self._index.clear()
+                self._generation, self._index_offset = generation, len(generation)
+                self._index_lines = 0
+
+            index_file.seek(self._index_offset)
+            tail : bytes = index_file.read()
+
+        # ignore a trailing line that is still being written
+        complete : int = tail.rfind(b"\n") + 1
+        for line in tail[:complete].decode("ascii").splitlines():
+            key, offset, length = line.split()
+            self._index[key] = (int(offset), int(length))
+            self._index.move_to_end(key)
+            self._index_lines += 1
+        self._index_offset += complete
+
+    @property
+    def _stale(self) -> bool:
+        """Whether most index lines are superseded by later ones."""
+        return self._index_lines > 2 * len(self._index) + 64
+
+    @staticmethod
+    def _new_generation() -> str:
+        return f"#{os.urandom(8).hex()}\n"
+
+    def _append_index(self, key : str, offset : int, length : int) -> None:
+        # a single short O_APPEND write is atomic with respect to other appenders
+        fd : int = os.open(self._index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, f"{key} {offset} {length}\n".encode("ascii"))
+        finally:
+            os.close(fd)
+
+    def get(self, key : str) -> tuple[int, ...] | None:
+        lock_file : IO[bytes] = self._lock(fcntl.LOCK_SH)
+        try:
+            self._refresh()
+            if key not in self._index:
+                return None
+            offset, length = self._index[key]
+
+            actions : array = array(self._typecode)
+            with open(self._data_path, "rb") as data_file:
+                data_file.seek(offset)
+                actions.frombytes(data_file.read(length * actions.itemsize))
+
+            self._append_index(key, offset, length)
+            self._index.move_to_end(key)
+        finally:
+            lock_file.close()
+
+        if self._stale:
+            lock_file = self._lock(fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                if self._stale:
+                    self._rewrite_index()
+            finally:
+                lock_file.close()
+        return tuple(actions)
+
+    def put(self, key : str, actions : Iterable[int]) -> None:
+        encoded : bytes = array(self._typecode, actions).tobytes()
+
+        lock_file : IO[bytes] = self._lock(fcntl.LOCK_EX)
+        try:
+            self._refresh()
+            if key in self._index:
+                return
+            if not self._generation:
+                with open(self._index_path, "w", encoding = "ascii") as index_file:
+                    index_file.write(self._new_generation())
+
+            with open(self._data_path, "ab") as data_file:
+                offset : int = data_file.tell()
+                data_file.write(encoded)
+
+            self._append_index(key, offset, len(encoded) // array(self._typecode).itemsize)
+            self._refresh()
+
+            if offset + len(encoded) + self._index_offset > self.max_bytes:
+                self._compact()
+            elif self._stale:
+                self._rewrite_index()
+        finally:
+            lock_file.close()
+
+    def _compact(self) -> None:
+        """Rewrites data and index, keeping the most recently used derivations
+        that together with their index lines fit into half of ``max_bytes``.
+        Requires the exclusive lock."""
+        itemsize : int = array(self._typecode).itemsize
+        budget : int = self.max_bytes // 2
+        kept : list[tuple[str, int, int]] = []
+
+        for key, (offset, length) in reversed(self._index.items()):
+            # upper bound on the index line, whose offset is not known yet
+            size : int = length * itemsize + len(f"{key} {self.max_bytes} {length}\n")
+            if size > budget:
+                continue
+            budget -= size
+            kept.append((key, offset, length))
+        kept.reverse()
+
+        new_data_path : str = self._data_path + ".tmp"
+        new_index_path : str = self._index_path + ".tmp"
+        with open(self._data_path, "rb") as data_file, \
+             open(new_data_path, "wb") as new_data, \
+             open(new_index_path, "w", encoding = "ascii") as new_index:
+
+            new_index.write(self._new_generation())
+            for key, offset, length in kept:
+                data_file.seek(offset)
+                new_index.write(f"{key} {new_data.tell()} {length}\n")
+                new_data.write(data_file.read(length * itemsize))
+
+        os.replace(new_data_path, self._data_path)
+        os.replace(new_index_path, self._index_path)
+        self._refresh()
+
+    def _rewrite_index(self) -> None:
+        """Rewrites the index with one line per derivation in LRU order,
+        leaving the data file untouched. Requires the exclusive lock."""
+        new_index_path : str = self._index_path + ".tmp"
+        with open(new_index_path, "w", encoding = "ascii") as new_index:
+            new_index.write(self._new_generation())
+            for key, (offset, length) in self._index.items():
+                new_index.write(f"{key} {offset} {length}\n")
+
+        os.replace(new_index_path, self._index_path)
+        self._refresh()
+
+    def __contains__(self, key : str) -> bool:
+        lock_file : IO[bytes] = self._lock(fcntl.LOCK_SH)
+        try:
+            self._refresh()
+            return key in self._index
+        finally:
+            lock_file.close()
+
+    def __len__(self) -> int:
+        lock_file : IO[bytes] = self._lock(fcntl.LOCK_SH)
+        try:
+            self._refresh()
+            return len(self._index)
+        finally:
+            lock_file.close()
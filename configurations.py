@@ -54,6 +54,11 @@ class SetConfiguration(Configuration[IntBuffer, SingleElement[Candidate],
         self.repset : RepSet[Candidate] = self[2]
         self.labelled : RepSet[Constituent] = self[3]
         self.step : Counter = self[4]
+
+    @property
+    def final(self) -> bool:
+        """True once all tokens are shifted, labelled and combined into the focus."""
+        return self.buffer.empty and len(self.repset) == 0 and self.step % 2 == 0
     
     def format(self, token_info : Mapping[int, str] | None = None, padding : int = 10,
                show_name : bool = False, delimiter : str = " || ") -> str:
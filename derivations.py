@@ -0,0 +1,104 @@
+from configurations import Configuration, SetConfiguration, init_SetConfiguration
+from transitions import Transition, SetTransitionSet
+
+from typing import Callable, Generic, Iterable, Iterator, Mapping, Sequence, TypeVar
+from array import array
+from bisect import bisect_right
+
+T = TypeVar('T', bound = Configuration)
+
+class Derivation(Generic[T]):
+    """Compact trace of a derivation. Only the initial configuration, the
+    action ids and every ``checkpoint_interval``-th configuration are kept;
+    any other step is rebuilt on demand by replaying the actions from the
+    nearest checkpoint before it.
+    """
+    def __init__(self, initial : T, decode : Callable[[int, T], Transition[T]],
+                 checkpoint_interval : int = 64) -> None:
+        self.initial : T = initial
+        self.actions : array = array("i")
+        self._decode : Callable[[int, T], Transition[T]] = decode
+        self._checkpoint_interval : int = checkpoint_interval
+        self._checkpoint_steps : list[int] = [0]
+        self._checkpoints : list[T] = [initial]
+        self._last : T = initial
+        self._cursor : tuple[int, T] = (0, initial)
+
+    @classmethod
+    def replay(cls, initial : T, actions : Iterable[int], decode : Callable[[int, T], Transition[T]],
+               checkpoint_interval : int = 64) -> "Derivation[T]":
+        """Builds a trace from action ids alone, e.g. from an oracle cache."""
+        derivation : Derivation[T] = cls(initial, decode, checkpoint_interval)
+        for action_id in actions:
+            derivation.apply(action_id)
+        return derivation
+
+    def append(self, action_id : int, configuration : T) -> None:
+        """Records an action whose resulting configuration the caller already has."""
+        self.actions.append(action_id)
+        self._last = configuration
+        if len(self.actions) % self._checkpoint_interval == 0:
+            self._checkpoint_steps.append(len(self.actions))
+            self._checkpoints.append(configuration)
+
+    def apply(self, action_id : int) -> T:
+        """Applies an action to the last configuration and records it."""
+        configuration : T = self._decode(action_id, self._last)(self._last)
+        self.append(action_id, configuration)
+        return configuration
+
+    @property
+    def last(self) -> T:
+        return self._last
+
+    def transition(self, step : int) -> Transition[T]:
+        """The transition leading from configuration ``step`` to ``step + 1``."""
+        if step < 0:
+            step += len(self.actions)
+        if not 0 <= step < len(self.actions):
+            raise IndexError(f"Step {step} out of range for derivation with {len(self.actions)} actions")
+        return self._decode(self.actions[step], self[step])
+
+    def __len__(self) -> int:
+        return len(self.actions) + 1
+
+    def __getitem__(self, step : int) -> T:
+        if step < 0:
+            step += len(self)
+        if not 0 <= step < len(self):
+            raise IndexError(f"Step {step} out of range for derivation of length {len(self)}")
+        if step == len(self.actions):
+            return self._last
+
+        checkpoint : int = bisect_right(self._checkpoint_steps, step) - 1
+        current_step : int = self._checkpoint_steps[checkpoint]
+        configuration : T = self._checkpoints[checkpoint]
+
+        # continue from the last reconstructed step when it is closer, so that
+        # walking through the derivation in order replays every action once
+        if current_step <= self._cursor[0] <= step:
+            current_step, configuration = self._cursor
+
+        while current_step < step:
+            configuration = self._decode(self.actions[current_step], configuration)(configuration)
+            current_step += 1
+
+        self._cursor = (step, configuration)
+        return configuration
+
+    def __iter__(self) -> Iterator[T]:
+        for step in range(len(self)):
+            yield self[step]
+
+    def format(self, step : int, token_info : Mapping[int, str] | None = None, padding : int = 10,
+               show_name : bool = False) -> str:
+        return self[step].format(token_info, padding, show_name)
+
+    def scope(self, step : int) -> tuple[tuple[tuple[int, ...], ...], ...]:
+        return self[step].scope
+
+def init_SetDerivation(num_tokens : int, labels : Sequence[str],
+                       checkpoint_interval : int = 64) -> Derivation[SetConfiguration]:
+    def decode(action_id : int, configuration : SetConfiguration) -> Transition[SetConfiguration]:
+        return SetTransitionSet.decode(action_id, configuration, labels)
+    return Derivation(init_SetConfiguration(num_tokens), decode, checkpoint_interval)
@@ -1,13 +1,85 @@
-from configurations import Configuration, SetConfiguration
-from transitions import Transition, SetTransition
+from configurations import Configuration, SetConfiguration, init_SetConfiguration
+from transitions import Transition, SetTransition, SetTransitionSet, SetShift, SetCombine, SetLabel, SetNoLabel
 from containers import RepSet, Container, RepresentationHolder
-from representations import Constituent, Representation
+from representations import Candidate, Constituent, Representation
+from caches import OracleCache, oracle_key
 
-from typing import Callable, TypeVar
+from typing import Callable, TypeVar, Sequence
 
 from abc import ABC, abstractmethod, abstractclassmethod
 
 R = TypeVar("R", bound = Representation)
 
+SET_ORACLE_VERSION : int = 2
+"""Bump whenever set_oracle may produce a different derivation for the same
+input; derivations cached by an older oracle are then ignored."""
+
+def _parent(candidate : Candidate, gold_tree : RepSet[Constituent]) -> Constituent | None:
+    """The smallest gold constituent strictly containing the candidate."""
+    parent : Constituent | None = None
+    for constituent in gold_tree:
+        if candidate < constituent and (parent is None or len(constituent) < len(parent)):
+            parent = constituent
+    return parent
+
 def set_oracle(configuration : SetConfiguration, gold_tree : RepSet[Constituent]) -> SetTransition:
-    pass
\ No newline at end of file
+    """Static oracle for the set transition system. On label steps the focus
+    is labelled if it is a gold constituent. On structural steps the focus is
+    combined with the rightmost candidate that has the same gold parent, a
+    token is shifted otherwise, and once the buffer is empty any remaining
+    candidate is combined."""
+    focus : Candidate | None = configuration.focus.top
+
+    if configuration.step % 2 == 1:
+        assert(focus is not None)
+        for constituent in gold_tree:
+            if constituent == focus:
+                return SetLabel(constituent.label)
+        return SetNoLabel()
+
+    if focus is None:
+        return SetShift()
+
+    parent : Constituent | None = _parent(focus, gold_tree)
+
+    # the rightmost sibling, so that combining proceeds inside out
+    selected : Candidate | None = None
+    if parent is not None:
+        for candidate in configuration.repset:
+            if (_parent(candidate, gold_tree) == parent
+                    and (selected is None or min(candidate) > min(selected))):
+                selected = candidate
+
+    if selected is not None:
+        return SetCombine(selected)
+    elif not configuration.buffer.empty:
+        return SetShift()
+    elif len(configuration.repset) != 0:
+        # nothing left to shift: merge whatever lies outside the gold tree
+        return SetCombine(max(configuration.repset, key = min))
+    else:
+        raise ValueError(f"No transition reaches {gold_tree!r} from {configuration!r}")
+
+def set_derivation(num_tokens : int, gold_tree : RepSet[Constituent], labels : Sequence[str],
+                   cache : OracleCache | None = None) -> tuple[int, ...]:
+    """Runs set_oracle from the initial configuration to the final one and
+    returns the action ids of the derivation, looking them up in and storing
+    them to the cache if one is given."""
+    key : str | None = None
+    if cache is not None:
+        key = oracle_key(gold_tree, labels, num_tokens, SET_ORACLE_VERSION)
+        cached : tuple[int, ...] | None = cache.get(key)
+        if cached is not None:
+            return cached
+
+    configuration : SetConfiguration = init_SetConfiguration(num_tokens)
+    actions : list[int] = []
+    while not configuration.final:
+        transition : SetTransition = set_oracle(configuration, gold_tree)
+        actions.append(SetTransitionSet.encode(transition, labels))
+        configuration = transition(configuration)
+
+    if cache is not None:
+        assert(key is not None)
+        cache.put(key, actions)
+    return tuple(actions)
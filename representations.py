@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod, abstractproperty
 
 from typing import Iterable, TypeVar, Mapping, FrozenSet, Generic
@@ -15,8 +17,20 @@ class Representation(ABC):
         ...
 
 class Token(int, Representation):
+    intern_bound : int = 1024
+    """Tokens with an index below this bound are shared instances."""
+    _interned : dict[int, "Token"] = {}
+
     def __new__ (cls, index : int) -> "Token":
-        return super(Token, cls).__new__(cls, index) # type: ignore
+        if cls is not Token:
+            return super(Token, cls).__new__(cls, index) # type: ignore
+
+        token : Token | None = cls._interned.get(index)
+        if token is None:
+            token = super(Token, cls).__new__(cls, index) # type: ignore
+            if 0 <= index < cls.intern_bound:
+                cls._interned[index] = token
+        return token
     
     def __init__(self, index : int) -> None:
         pass
@@ -68,8 +82,17 @@ class Constituent(Candidate):
 
 
 class Label(str, Representation):
+    _interned : dict[str, "Label"] = {}
+
     def __new__ (cls, label : str) -> "Label":
-        return super(Label, cls).__new__(cls, label) # type: ignore
+        if cls is not Label:
+            return super(Label, cls).__new__(cls, label) # type: ignore
+
+        interned : Label | None = cls._interned.get(label)
+        if interned is None:
+            interned = super(Label, cls).__new__(cls, label) # type: ignore
+            cls._interned[label] = interned
+        return interned
     
     def __init__(self, label : str) -> None:
         pass
@@ -81,7 +104,7 @@ class Label(str, Representation):
     def scope(self) -> tuple[int, ...]:
         return tuple()
     
-class Node(Generic[R], "tuple[Node[R], ...]", Representation):
+class Node(tuple["Node[R]", ...], Representation, Generic[R]):
     def __new__ (cls, content : R, 
                  children : tuple[Node[R], ...] = tuple()) -> "Node":
         
@@ -0,0 +1,87 @@
+from caches import OracleCache, oracle_key
+from oracles import set_derivation, SET_ORACLE_VERSION
+from derivations import Derivation, init_SetDerivation
+from configurations import SetConfiguration
+from containers import RepSet
+from representations import Constituent, Token
+
+from pathlib import Path
+
+import os
+
+def test_put_get_roundtrip(tmp_path : Path) -> None:
+    cache : OracleCache = OracleCache(str(tmp_path))
+    cache.put("a", [0, 2, 1, 5])
+
+    assert cache.get("a") == (0, 2, 1, 5)
+    assert cache.get("b") is None
+    assert OracleCache(str(tmp_path)).get("a") == (0, 2, 1, 5)
+
+def test_eviction_follows_access_order(tmp_path : Path) -> None:
+    cache : OracleCache = OracleCache(str(tmp_path), max_bytes = 360)
+    for key in ("a", "b", "c"):
+        cache.put(key, range(20))
+    cache.get("a")
+
+    # the fourth derivation pushes data and index over max_bytes
+    cache.put("d", range(20))
+
+    assert "b" not in cache and "c" not in cache
+    assert cache.get("a") == tuple(range(20))
+    assert cache.get("d") == tuple(range(20))
+
+def test_reload_after_compaction(tmp_path : Path) -> None:
+    reader : OracleCache = OracleCache(str(tmp_path), max_bytes = 360)
+    writer : OracleCache = OracleCache(str(tmp_path), max_bytes = 360)
+    writer.put("a", range(20))
+    assert reader.get("a") == tuple(range(20))
+
+    for key in ("b", "c", "d"):
+        writer.put(key, [ord(key)] * 20)
+
+    assert "a" not in reader
+    assert reader.get("d") == (ord("d"),) * 20
+
+def test_index_stays_bounded_under_reads(tmp_path : Path) -> None:
+    cache : OracleCache = OracleCache(str(tmp_path))
+    for key in ("a", "b"):
+        cache.put(key, range(10))
+    for _ in range(10000):
+        cache.get("a")
+
+    assert os.path.getsize(os.path.join(str(tmp_path), "derivations.idx")) < 10000
+    assert cache.get("b") == tuple(range(10))
+
+def test_key_is_unambiguous() -> None:
+    first : RepSet[Constituent] = RepSet([Constituent([Token(1)], "X"), Constituent([Token(2)], "Y")])
+    second : RepSet[Constituent] = RepSet([Constituent([Token(2)], "X:1;Y")])
+    reordered : RepSet[Constituent] = RepSet([Constituent([Token(2)], "Y"), Constituent([Token(1)], "X")])
+
+    assert oracle_key(first, ["X"], 3, 1) != oracle_key(second, ["X"], 3, 1)
+    assert oracle_key(first, ["X"], 3, 1) == oracle_key(reordered, ["X"], 3, 1)
+    assert oracle_key(first, ["X"], 3, 1) != oracle_key(first, ["X"], 3, 2)
+
+def test_set_derivation_uses_cache(tmp_path : Path) -> None:
+    gold_tree : RepSet[Constituent] = RepSet([Constituent([Token(0), Token(1), Token(2)], "S"),
+                                              Constituent([Token(0), Token(1)], "NP")])
+    cache : OracleCache = OracleCache(str(tmp_path))
+
+    derivation : tuple[int, ...] = set_derivation(3, gold_tree, ["S", "NP"], cache)
+
+    assert oracle_key(gold_tree, ["S", "NP"], 3, SET_ORACLE_VERSION) in cache
+    assert set_derivation(3, gold_tree, ["S", "NP"], cache) == derivation
+    assert derivation == set_derivation(3, gold_tree, ["S", "NP"])
+
+def test_set_derivation_builds_gold_tree() -> None:
+    labels : list[str] = ["S", "VP"]
+    gold_tree : RepSet[Constituent] = RepSet([Constituent([Token(0), Token(1), Token(2)], "S"),
+                                              Constituent([Token(0), Token(2)], "VP")])
+
+    derivation : Derivation[SetConfiguration] = init_SetDerivation(3, labels)
+    for action_id in set_derivation(3, gold_tree, labels):
+        derivation.apply(action_id)
+
+    assert derivation.last.final
+    # Constituent equality ignores labels, so compare them explicitly
+    assert ({(c.label, c) for c in derivation.last.labelled}
+            == {(c.label, c) for c in gold_tree})
@@ -0,0 +1,30 @@
+from derivations import Derivation, init_SetDerivation
+from configurations import SetConfiguration
+from transitions import SetCombine, SetLabel
+
+import pytest
+
+def _derivation(checkpoint_interval : int) -> tuple[Derivation[SetConfiguration], list[SetConfiguration]]:
+    derivation : Derivation[SetConfiguration] = init_SetDerivation(3, ["NP", "S"], checkpoint_interval)
+    configurations : list[SetConfiguration] = [derivation.initial]
+    for action_id in (0, 1, 0, 1, 4, 2, 0, 1, 4, 3):
+        configurations.append(derivation.apply(action_id))
+    return derivation, configurations
+
+def test_replay_matches_forward_application() -> None:
+    derivation, configurations = _derivation(checkpoint_interval = 3)
+
+    assert derivation.last.final
+    assert list(derivation) == configurations
+    for step in reversed(range(len(configurations))):
+        assert derivation.format(step) == configurations[step].format()
+        assert derivation.scope(step) == configurations[step].scope
+
+def test_transition_index() -> None:
+    derivation, configurations = _derivation(checkpoint_interval = 4)
+
+    assert isinstance(derivation.transition(-1), SetLabel)
+    assert isinstance(derivation.transition(-2), SetCombine)
+    assert derivation.transition(-2) == derivation.transition(len(derivation.actions) - 2)
+    with pytest.raises(IndexError):
+        derivation.transition(len(derivation.actions))
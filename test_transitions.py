@@ -0,0 +1,42 @@
+from transitions import SetShift, SetNoLabel, SetLabel, SetCombine
+from representations import Candidate, Label, Token
+
+import copy
+import pickle
+
+def test_interned_instances() -> None:
+    assert Token(3) is Token(3)
+    assert Label("NP") is Label("NP")
+    assert SetShift() is SetShift()
+    assert SetNoLabel() is SetNoLabel()
+    assert SetLabel("NP") is SetLabel(Label("NP"))
+
+def test_copies_stay_interned() -> None:
+    for transition in (SetShift(), SetNoLabel(), SetLabel("NP")):
+        assert pickle.loads(pickle.dumps(transition)) is transition
+        assert copy.deepcopy(transition) is transition
+
+    combine : SetCombine = SetCombine(Candidate([Token(0), Token(1)]))
+    assert pickle.loads(pickle.dumps(combine)) == combine
+    assert len({combine, copy.deepcopy(combine)}) == 1
+
+def test_keyword_arguments() -> None:
+    assert SetLabel(label = "NP") is SetLabel("NP")
+
+def test_combine_is_not_interned() -> None:
+    candidate : Candidate = Candidate([Token(0)])
+
+    assert SetCombine(candidate) is not SetCombine(candidate)
+    assert SetCombine(candidate) == SetCombine(Candidate([Token(0)]))
+    assert not SetCombine._instances
+
+def test_subclasses_are_not_interned() -> None:
+    class SubToken(Token):
+        pass
+
+    class SubLabel(Label):
+        pass
+
+    Token(3), Label("NP")
+    assert type(SubToken(3)) is SubToken
+    assert type(SubLabel("NP")) is SubLabel
@@ -1,12 +1,16 @@
-from representations import Representation, Token, Candidate, Constituent
+from representations import Representation, Token, Candidate, Constituent, Label
 from containers import Buffer, Stack, RepSet, SingleElement, IntBuffer
 from configurations import Configuration, SetConfiguration
 
-from typing import Iterable, TypeVar, Mapping, Set, FrozenSet, Generic, overload
-from abstract_helpers import ABC, abstractmethod
+from typing import Iterable, TypeVar, Mapping, Set, FrozenSet, Generic, Sequence, overload
+from abstract_helpers import ABC, InterningABCMeta, abstractmethod
 
 T = TypeVar('T', bound = Configuration)
 
+TRANSITION_SYSTEM_VERSION : int = 1
+"""Bump whenever the semantics or the action id encoding of a transition
+system changes; derivations cached under an older version are then ignored."""
+
 class Transition(ABC, Generic[T]):
     @abstractmethod
     def apply(self, configuration : T) -> T:
@@ -19,7 +23,17 @@ class Transition(ABC, Generic[T]):
     def __call__(self, configuration : T) -> T:
         return self.apply(configuration)
     
-class SetTransition(Transition[SetConfiguration]):
+class SetTransition(Transition[SetConfiguration], metaclass = InterningABCMeta):
+    """Set transitions are interned: SetShift() and SetNoLabel() are
+    singletons and SetLabel is shared per label."""
+    @property
+    def _arguments(self) -> tuple[object, ...]:
+        return tuple()
+
+    def __reduce__(self) -> tuple[type, tuple[object, ...]]:
+        # rebuild through the constructor so that copies are interned as well
+        return self.__class__, self._arguments
+
     @abstractmethod
     def apply(self, configuration : SetConfiguration) -> SetConfiguration:
         ...
@@ -69,8 +83,21 @@ class SetShift(SetEven):
         return (not configuration.buffer.empty) and super().check(configuration)
 
 class SetCombine(SetEven):
+    # candidates differ between sentences, so sharing instances would only pin them
+    _intern : bool = False
+
     def __init__(self, selected : Candidate):
         self.selected : Candidate = selected
+
+    @property
+    def _arguments(self) -> tuple[object, ...]:
+        return (self.selected,)
+
+    def __eq__(self, other : object) -> bool:
+        return self is other or (isinstance(other, SetCombine) and self.selected == other.selected)
+
+    def __hash__(self) -> int:
+        return hash((SetCombine, self.selected))
     
     def apply(self, configuration : SetConfiguration) -> SetConfiguration:
         assert(configuration.focus.top)
@@ -90,7 +117,17 @@ class SetCombine(SetEven):
         
 class SetLabel(SetOdd):
     def __init__(self, label : str):
-        self.label : str = label
+        self.label : Label = Label(label)
+
+    @property
+    def _arguments(self) -> tuple[object, ...]:
+        return (str(self.label),)
+
+    def __eq__(self, other : object) -> bool:
+        return self is other or (isinstance(other, SetLabel) and self.label == other.label)
+
+    def __hash__(self) -> int:
+        return hash((SetLabel, self.label))
     
     def apply(self, configuration : SetConfiguration) -> SetConfiguration:
         assert(configuration.focus.top)
@@ -141,5 +178,39 @@ class SetTransitionSet(TransitionSet[SetTransition]):
         
         return SetTransitionSet(transition_set)
 
+    @staticmethod
+    def encode(transition : SetTransition, labels : Sequence[str]) -> int:
+        """Maps a transition to its action id: 0 for shift, 1 for no-label,
+        2 + i for the i-th label and 2 + len(labels) + k for combining
+        the candidate whose leftmost token is k."""
+        if isinstance(transition, SetShift):
+            return 0
+        elif isinstance(transition, SetNoLabel):
+            return 1
+        elif isinstance(transition, SetLabel):
+            return 2 + labels.index(transition.label)
+        elif isinstance(transition, SetCombine):
+            return 2 + len(labels) + min(transition.selected)
+        else:
+            raise ValueError(f"Cannot encode transition {transition!r}")
+
+    @staticmethod
+    def decode(action_id : int, configuration : SetConfiguration, labels : Sequence[str]) -> SetTransition:
+        """Inverse of encode; combine ids are resolved against the
+        candidates of the given configuration."""
+        if action_id == 0:
+            return SetShift()
+        elif action_id == 1:
+            return SetNoLabel()
+        elif action_id < 2 + len(labels):
+            return SetLabel(labels[action_id - 2])
+        
+        leftmost : int = action_id - 2 - len(labels)
+        for candidate in configuration.repset:
+            if min(candidate) == leftmost:
+                return SetCombine(candidate)
+        
+        raise ValueError(f"No candidate starting at token {leftmost} in {configuration!r}")
+
     def __init__(self, transitions : Iterable[SetTransition]):
         super().__init__(transitions)